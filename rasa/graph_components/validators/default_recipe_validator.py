@@ -1,6 +1,6 @@
 from __future__ import annotations
-from collections import defaultdict
-from typing import Iterable, List, Dict, Text, Any, Set, Type
+import functools
+from typing import Iterable, List, Dict, Text, Any, Set, Tuple, Type
 
 from rasa.engine.graph import ExecutionContext, GraphComponent, GraphSchema, SchemaNode
 from rasa.engine.storage.storage import ModelStorage
@@ -61,6 +61,68 @@ POLICY_CLASSSES = {
     RulePolicyGraphComponent,
 }
 
+# Precomputed component sets used for membership checks during validation. These
+# are hoisted to module level so that the checks do not need to rebuild the same
+# collections on every call.
+_TRAINABLE_EXTRACTORS_SET = frozenset(TRAINABLE_EXTRACTORS)
+_DIET_OR_CRF = frozenset(
+    {DIETClassifierGraphComponent, CRFEntityExtractorGraphComponent}
+)
+_REGEX_COMPONENTS = frozenset(
+    {RegexFeaturizerGraphComponent, RegexEntityExtractorGraphComponent}
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _classify_component_type(
+    component_type: Type[GraphComponent],
+) -> Tuple[bool, bool, bool]:
+    """Determines which validation categories a component type belongs to.
+
+    The result is memoized since a graph schema only contains a handful of
+    unique component types, while the `issubclass` checks walk the full MRO.
+
+    Args:
+        component_type: a component type used by some schema node
+    Returns:
+        whether the type is a policy, a tokenizer, and a featurizer
+    """
+    return (
+        issubclass(component_type, PolicyGraphComponent),
+        issubclass(component_type, TokenizerGraphComponent),
+        issubclass(component_type, Featurizer2),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _default_priority(policy_type: Type[PolicyGraphComponent]) -> int:
+    """Returns the default priority of the given policy type.
+
+    Memoized since `get_default_config` rebuilds its dict on every call and
+    the same policy class may appear in several schema nodes.
+
+    Args:
+        policy_type: a policy type
+    Returns:
+        the default priority of that policy type
+    """
+    return policy_type.get_default_config()["priority"]
+
+
+@functools.lru_cache(maxsize=None)
+def _supported_data(policy_type: Type[PolicyGraphComponent]) -> SupportedData:
+    """Returns which kind of training data the given policy type supports.
+
+    Memoized so the classmethod is resolved once per policy class
+    process-wide rather than once per schema node per validation.
+
+    Args:
+        policy_type: a policy type
+    Returns:
+        the supported training data type
+    """
+    return policy_type.supported_data()
+
 
 def _types_to_str(types: Iterable[Type]) -> Text:
     """Returns a text containing the names of all given types.
@@ -70,7 +132,12 @@ def _types_to_str(types: Iterable[Type]) -> Text:
     Returns:
         text containing all type names
     """
-    return ", ".join([type.__name__ for type in types])
+    return ", ".join(type.__name__ for type in types)
+
+
+# The trainable extractors are referenced in several warnings; render the
+# name list once at import time instead of on every warning.
+_TRAINABLE_EXTRACTORS_STR = _types_to_str(TRAINABLE_EXTRACTORS)
 
 
 class DefaultV1RecipeValidator(GraphComponent):
@@ -94,12 +161,52 @@ class DefaultV1RecipeValidator(GraphComponent):
            graph_schema: a graph schema
         """
         self._graph_schema = graph_schema
-        self._component_types = set(node.uses for node in graph_schema.nodes.values())
-        self._policy_schema_nodes: List[SchemaNode] = [
-            node
-            for node in self._graph_schema.nodes.values()
-            if issubclass(node.uses, PolicyGraphComponent)
-        ]
+        self._policy_schema_nodes: List[SchemaNode] = []
+        self._tokenizer_types: List[Type[GraphComponent]] = []
+        self._featurizer_schema_nodes: List[SchemaNode] = []
+        self._rule_policy_schema_nodes: List[SchemaNode] = []
+        self._crf_schema_nodes: List[SchemaNode] = []
+        # Classify all schema nodes in a single traversal instead of re-scanning
+        # the graph schema once per validation.
+        for node in graph_schema.nodes.values():
+            component_type = node.uses
+            is_policy, is_tokenizer, is_featurizer = _classify_component_type(
+                component_type
+            )
+            if is_policy:
+                self._policy_schema_nodes.append(node)
+                if component_type is RulePolicyGraphComponent:
+                    self._rule_policy_schema_nodes.append(node)
+            elif is_tokenizer:
+                self._tokenizer_types.append(component_type)
+            elif is_featurizer:
+                self._featurizer_schema_nodes.append(node)
+            elif component_type is CRFEntityExtractorGraphComponent:
+                self._crf_schema_nodes.append(node)
+        self._has_rule_policy = bool(self._rule_policy_schema_nodes)
+        self._consuming_rule_data = any(
+            _supported_data(node.uses)
+            in {SupportedData.RULE_DATA, SupportedData.ML_AND_RULE_DATA}
+            for node in self._policy_schema_nodes
+        )
+        self._component_types = frozenset(
+            node.uses for node in graph_schema.nodes.values()
+        )
+        self._present_trainable_extractors = self._component_types.intersection(
+            _TRAINABLE_EXTRACTORS_SET
+        )
+        # Presence flags for the component types the validator repeatedly
+        # checks for, so the checks become plain attribute reads.
+        self._has_response_selector = (
+            ResponseSelectorGraphComponent in self._component_types
+        )
+        self._has_regex_entity_extractor = (
+            RegexEntityExtractorGraphComponent in self._component_types
+        )
+        self._has_crf_entity_extractor = bool(self._crf_schema_nodes)
+        self._has_entity_synonym_mapper = (
+            EntitySynonymMapperComponent in self._component_types
+        )
 
     def validate(self, importer: TrainingDataImporter) -> TrainingDataImporter:
         """Validates the current graph schema against the training data and domain.
@@ -141,10 +248,26 @@ class DefaultV1RecipeValidator(GraphComponent):
         Args:
             training_data: The training data for the NLU components.
         """
-        if (
-            training_data.response_examples
-            and ResponseSelectorGraphComponent not in self._component_types
+        has_response_examples = bool(training_data.response_examples)
+        has_entity_examples = bool(training_data.entity_examples)
+        has_regex_features = bool(training_data.regex_features)
+        has_lookup_tables = bool(training_data.lookup_tables)
+        has_entity_synonyms = bool(training_data.entity_synonyms)
+        if not (
+            has_response_examples
+            or has_entity_examples
+            or has_regex_features
+            or has_lookup_tables
+            or has_entity_synonyms
         ):
+            # Nothing in the training data that could go unused - this is the
+            # common case for Core-only projects.
+            return
+        missing_diet_and_crf = (
+            has_entity_examples or has_lookup_tables
+        ) and self._component_types.isdisjoint(_DIET_OR_CRF)
+
+        if has_response_examples and not self._has_response_selector:
             rasa.shared.utils.io.raise_warning(
                 f"You have defined training data with examples for training a response "
                 f"selector, but your NLU configuration does not include a response "
@@ -154,22 +277,18 @@ class DefaultV1RecipeValidator(GraphComponent):
                 docs=DOCS_URL_COMPONENTS,
             )
 
-        if training_data.entity_examples and self._component_types.isdisjoint(
-            TRAINABLE_EXTRACTORS
-        ):
-            rasa.shared.utils.io.raise_warning(
-                f"You have defined training data consisting of entity examples, but "
-                f"your NLU configuration does not include an entity extractor "
-                f"trained on your training data. "
-                f"To extract non-pretrained entities, add one of "
-                f"{_types_to_str(TRAINABLE_EXTRACTORS)} to your configuration.",
-                docs=DOCS_URL_COMPONENTS,
-            )
+        if has_entity_examples:
+            if self._component_types.isdisjoint(_TRAINABLE_EXTRACTORS_SET):
+                rasa.shared.utils.io.raise_warning(
+                    f"You have defined training data consisting of entity examples, "
+                    f"but your NLU configuration does not include an entity extractor "
+                    f"trained on your training data. "
+                    f"To extract non-pretrained entities, add one of "
+                    f"{_TRAINABLE_EXTRACTORS_STR} to your configuration.",
+                    docs=DOCS_URL_COMPONENTS,
+                )
 
-        if training_data.entity_examples and self._component_types.isdisjoint(
-            {DIETClassifierGraphComponent, CRFEntityExtractorGraphComponent}
-        ):
-            if training_data.entity_roles_groups_used():
+            if missing_diet_and_crf and training_data.entity_roles_groups_used():
                 rasa.shared.utils.io.raise_warning(
                     f"You have defined training data with entities that "
                     f"have roles/groups, but your NLU configuration does not "
@@ -182,9 +301,7 @@ class DefaultV1RecipeValidator(GraphComponent):
                     docs=DOCS_URL_COMPONENTS,
                 )
 
-        if training_data.regex_features and self._component_types.isdisjoint(
-            [RegexFeaturizerGraphComponent, RegexEntityExtractorGraphComponent],
-        ):
+        if has_regex_features and self._component_types.isdisjoint(_REGEX_COMPONENTS):
             rasa.shared.utils.io.raise_warning(
                 f"You have defined training data with regexes, but "
                 f"your NLU configuration does not include a 'RegexFeaturizer' "
@@ -196,25 +313,20 @@ class DefaultV1RecipeValidator(GraphComponent):
                 docs=DOCS_URL_COMPONENTS,
             )
 
-        if training_data.lookup_tables and self._component_types.isdisjoint(
-            [RegexFeaturizerGraphComponent, RegexEntityExtractorGraphComponent],
-        ):
-            rasa.shared.utils.io.raise_warning(
-                f"You have defined training data consisting of lookup tables, but "
-                f"your NLU configuration does not include a featurizer "
-                f"or an entity extractor using the lookup table."
-                f"To use the lookup tables, include either a "
-                f"'{RegexFeaturizerGraphComponent.__name__}' "
-                f"or a '{RegexEntityExtractorGraphComponent.__name__}' "
-                f"in your configuration.",
-                docs=DOCS_URL_COMPONENTS,
-            )
-
-        if training_data.lookup_tables:
+        if has_lookup_tables:
+            if self._component_types.isdisjoint(_REGEX_COMPONENTS):
+                rasa.shared.utils.io.raise_warning(
+                    f"You have defined training data consisting of lookup tables, but "
+                    f"your NLU configuration does not include a featurizer "
+                    f"or an entity extractor using the lookup table."
+                    f"To use the lookup tables, include either a "
+                    f"'{RegexFeaturizerGraphComponent.__name__}' "
+                    f"or a '{RegexEntityExtractorGraphComponent.__name__}' "
+                    f"in your configuration.",
+                    docs=DOCS_URL_COMPONENTS,
+                )
 
-            if self._component_types.isdisjoint(
-                [CRFEntityExtractorGraphComponent, DIETClassifierGraphComponent]
-            ):
+            if missing_diet_and_crf:
                 rasa.shared.utils.io.raise_warning(
                     f"You have defined training data consisting of lookup tables, but "
                     f"your NLU configuration does not include any components "
@@ -228,17 +340,12 @@ class DefaultV1RecipeValidator(GraphComponent):
                     docs=DOCS_URL_COMPONENTS,
                 )
 
-            elif CRFEntityExtractorGraphComponent in self._component_types:
+            elif self._has_crf_entity_extractor:
 
-                crf_schema_nodes = [
-                    schema_node
-                    for schema_node in self._graph_schema.nodes.values()
-                    if schema_node.uses == CRFEntityExtractorGraphComponent
-                ]
                 has_pattern_feature = any(
                     CRFEntityExtractorOptions.PATTERN in feature_list
-                    for crf in crf_schema_nodes
-                    for feature_list in crf.config.get("features", [])
+                    for crf in self._crf_schema_nodes
+                    for feature_list in crf.config.get("features", ())
                 )
 
                 if not has_pattern_feature:
@@ -254,10 +361,7 @@ class DefaultV1RecipeValidator(GraphComponent):
                         docs=DOCS_URL_COMPONENTS,
                     )
 
-        if (
-            training_data.entity_synonyms
-            and EntitySynonymMapperComponent not in self._component_types
-        ):
+        if has_entity_synonyms and not self._has_entity_synonym_mapper:
             rasa.shared.utils.io.raise_warning(
                 f"You have defined synonyms in your training data, but "
                 f"your NLU configuration does not include an "
@@ -277,19 +381,15 @@ class DefaultV1RecipeValidator(GraphComponent):
         Raises:
             `InvalidConfigException` in case there is more than one tokenizer
         """
-        types_of_tokenizer_schema_nodes = [
-            schema_node.uses
-            for schema_node in self._graph_schema.nodes.values()
-            if issubclass(schema_node.uses, TokenizerGraphComponent)
-        ]
-
-        if len(types_of_tokenizer_schema_nodes) > 1:
-            raise InvalidConfigException(
-                f"The configuration configuration contains more than one tokenizer, "
-                f"which is not possible at this time. You can only use one tokenizer. "
-                f"The configuration contains the following tokenizers: "
-                f"{_types_to_str(types_of_tokenizer_schema_nodes)}. "
-            )
+        if len(self._tokenizer_types) < 2:
+            return
+
+        raise InvalidConfigException(
+            f"The configuration configuration contains more than one tokenizer, "
+            f"which is not possible at this time. You can only use one tokenizer. "
+            f"The configuration contains the following tokenizers: "
+            f"{_types_to_str(self._tokenizer_types)}. "
+        )
 
     def _warn_of_competing_extractors(self) -> None:
         """Warns the user when using competing extractors.
@@ -303,7 +403,7 @@ class DefaultV1RecipeValidator(GraphComponent):
         """
         extractors_in_configuration: Set[
             Type[GraphComponent]
-        ] = self._component_types.intersection(TRAINABLE_EXTRACTORS)
+        ] = self._present_trainable_extractors
         if len(extractors_in_configuration) > 1:
             rasa.shared.utils.io.raise_warning(
                 f"You have defined multiple entity extractors that do the same job "
@@ -328,19 +428,21 @@ class DefaultV1RecipeValidator(GraphComponent):
         Args:
             training_data: The training data for the NLU components.
         """
-        present_general_extractors = self._component_types.intersection(
-            TRAINABLE_EXTRACTORS
-        )
-        has_general_extractors = len(present_general_extractors) > 0
-        has_regex_extractor = (
-            RegexEntityExtractorGraphComponent in self._component_types
-        )
+        if not self._has_regex_entity_extractor:
+            return
+
+        present_general_extractors = self._present_trainable_extractors
+        if not present_general_extractors:
+            return
+
+        if not training_data.regex_features:
+            return
 
         regex_entity_types = {rf["name"] for rf in training_data.regex_features}
-        overlap_between_types = training_data.entities.intersection(regex_entity_types)
-        has_overlap = len(overlap_between_types) > 0
+        # Intersect starting from the typically much smaller regex-name set.
+        overlap_between_types = regex_entity_types & training_data.entities
 
-        if has_general_extractors and has_regex_extractor and has_overlap:
+        if overlap_between_types:
             rasa.shared.utils.io.raise_warning(
                 f"You have an overlap between the "
                 f"'{RegexEntityExtractorGraphComponent.__name__}' and the "
@@ -363,13 +465,8 @@ class DefaultV1RecipeValidator(GraphComponent):
         Raises:
             `InvalidConfigException` in case the featurizers are not compatible
         """
-        featurizers: List[SchemaNode] = [
-            node
-            for node in self._graph_schema.nodes.values()
-            if issubclass(node.uses, Featurizer2)
-        ]
         Featurizer2.raise_if_featurizer_configs_are_not_compatible(
-            [schema_node.config for schema_node in featurizers]
+            schema_node.config for schema_node in self._featurizer_schema_nodes
         )
 
     def _validate_core(self, story_graph: StoryGraph, domain: Domain) -> None:
@@ -394,9 +491,7 @@ class DefaultV1RecipeValidator(GraphComponent):
 
     def _warn_if_no_rule_policy_is_contained(self) -> None:
         """Warns if there is no rule policy among the given policies."""
-        if not any(
-            node.uses == RulePolicyGraphComponent for node in self._policy_schema_nodes
-        ):
+        if not self._has_rule_policy:
             rasa.shared.utils.io.raise_warning(
                 f"'{RulePolicyGraphComponent.__name__}' is not included in the model's "
                 f"policy configuration. Default intents such as "
@@ -414,13 +509,7 @@ class DefaultV1RecipeValidator(GraphComponent):
         Raises:
             `InvalidConfigException` if domain and rule policies do not match
         """
-        contains_rule_policy = any(
-            schema_node
-            for schema_node in self._graph_schema.nodes.values()
-            if schema_node.uses == RulePolicyGraphComponent
-        )
-
-        if domain.form_names and not contains_rule_policy:
+        if domain.form_names and not self._has_rule_policy:
             raise InvalidDomain(
                 "You have defined a form action, but have not added the "
                 f"'{RulePolicyGraphComponent.__name__}' to your policy ensemble. "
@@ -436,19 +525,19 @@ class DefaultV1RecipeValidator(GraphComponent):
         Raises:
             `InvalidDomain` if domain and rule policies do not match
         """
-        for schema_node in self._graph_schema.nodes.values():
-            if schema_node.uses == RulePolicyGraphComponent:
-                RulePolicyGraphComponent.raise_if_incompatible_with_domain(
-                    config=schema_node.config, domain=domain
-                )
+        for schema_node in self._rule_policy_schema_nodes:
+            RulePolicyGraphComponent.raise_if_incompatible_with_domain(
+                config=schema_node.config, domain=domain
+            )
 
     def _warn_if_priorities_are_not_unique(self) -> None:
         """Warns if the priorities of the policies are not unique."""
-        priority_dict = defaultdict(list)
+        priority_dict: Dict[int, List[Type[GraphComponent]]] = {}
         for schema_node in self._policy_schema_nodes:
-            default_priority = schema_node.uses.get_default_config()["priority"]
-            priority = schema_node.config.get("priority", default_priority)
-            priority_dict[priority].append(schema_node.uses)
+            priority = schema_node.config.get(
+                "priority", _default_priority(schema_node.uses)
+            )
+            priority_dict.setdefault(priority, []).append(schema_node.uses)
 
         for k, v in priority_dict.items():
             if len(v) > 1:
@@ -468,17 +557,13 @@ class DefaultV1RecipeValidator(GraphComponent):
         Args:
             story_graph: a story graph (core training data)
         """
-        consuming_rule_data = any(
-            policy_node.uses.supported_data()
-            in [SupportedData.RULE_DATA, SupportedData.ML_AND_RULE_DATA]
-            for policy_node in self._policy_schema_nodes
-        )
+        consuming_rule_data = self._consuming_rule_data
 
         # Reminder: We generate rule trackers via:
         #   rasa/shared/core/generator/...
         #   .../TrainingDataGenerator/_generate_rule_trackers/
         contains_rule_tracker = any(
-            isinstance(step, RuleStep) for step in story_graph.ordered_steps()
+            type(step) is RuleStep for step in story_graph.ordered_steps()
         )
 
         if consuming_rule_data and not contains_rule_tracker:
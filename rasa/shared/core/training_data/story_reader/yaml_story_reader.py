@@ -436,8 +436,9 @@ class YAMLStoryReader(StoryReader):
 
         if KEY_USER_MESSAGE in step:
             user_message = step[KEY_USER_MESSAGE].strip()
-            entities = entities_parser.find_entities_in_training_example(user_message)
-            plain_text = entities_parser.replace_entities(user_message)
+            plain_text, entities = entities_parser.extract_entities_and_text(
+                user_message
+            )
 
             if plain_text.startswith(INTENT_MESSAGE_PREFIX):
                 entities = (
@@ -9,6 +9,11 @@ YAML_FILE_EXTENSIONS = [".yml", ".yaml"]
 JSON_FILE_EXTENSIONS = [".json"]
 TRAINING_DATA_EXTENSIONS = set(JSON_FILE_EXTENSIONS + YAML_FILE_EXTENSIONS)
 
+# `str.endswith` accepts a tuple of suffixes, which avoids constructing a
+# `Path` and a `set` for every file checked during a project scan.
+_YAML_SUFFIXES = tuple(YAML_FILE_EXTENSIONS)
+_JSON_SUFFIXES = tuple(JSON_FILE_EXTENSIONS)
+
 
 def yaml_file_extension() -> Text:
     """Return YAML file extension."""
@@ -24,7 +29,7 @@ def is_likely_yaml_file(file_path: Union[Text, Path]) -> bool:
     Returns:
         `True` if the file likely contains data in yaml format, `False` otherwise.
     """
-    return Path(file_path).suffix in set(YAML_FILE_EXTENSIONS)
+    return str(file_path).endswith(_YAML_SUFFIXES)
 
 
 def is_likely_json_file(file_path: Text) -> bool:
@@ -36,7 +41,7 @@ def is_likely_json_file(file_path: Text) -> bool:
     Returns:
         `True` if the file likely contains data in json format, `False` otherwise.
     """
-    return Path(file_path).suffix in set(JSON_FILE_EXTENSIONS)
+    return str(file_path).endswith(_JSON_SUFFIXES)
 
 
 def get_core_directory(paths: Optional[Union[Text, List[Text]]]) -> Text:
@@ -1,11 +1,27 @@
+import datetime
+import hashlib
 import logging
+import os
+import re
+import sys
 from collections import OrderedDict
 from pathlib import Path
-from typing import Text, Any, List, Dict, Tuple, Union, Iterator, Optional, Callable
+from typing import (
+    Text,
+    Any,
+    List,
+    Dict,
+    Set,
+    Tuple,
+    Union,
+    Iterator,
+    Optional,
+    Callable,
+)
 
 import rasa.shared.data
 from rasa.shared.core.domain import Domain
-from rasa.shared.exceptions import YamlException
+from rasa.shared.exceptions import RasaException, YamlException
 from rasa.shared.utils import validation
 from ruamel.yaml import StringIO
 from ruamel.yaml.scalarstring import LiteralScalarString
@@ -20,11 +36,129 @@ from rasa.shared.nlu.training_data.formats.readerwriter import (
     TrainingDataWriter,
 )
 import rasa.shared.utils.io
+import rasa.shared.nlu.training_data.entities_parser as entities_parser
+import rasa.shared.nlu.training_data.lookup_tables_parser as lookup_tables_parser
+import rasa.shared.nlu.training_data.synonyms_parser as synonyms_parser
 import rasa.shared.nlu.training_data.util
 from rasa.shared.nlu.training_data.training_data import TrainingData
 from rasa.shared.nlu.training_data.message import Message
 
 
+try:
+    # `PyYAML` with `libyaml` bindings parses large NLU files several times
+    # faster than the pure-Python loader. It is an optional speedup - if it is
+    # not installed we fall back to the default loader below.
+    from yaml import CSafeLoader as _CSafeLoader
+    from yaml import load as _fast_yaml_load
+except ImportError:
+    _FastYamlLoader = None
+else:
+
+    class _FastYamlLoader(_CSafeLoader):
+        """`CSafeLoader` adjusted to the YAML 1.2 semantics of the default loader.
+
+        PyYAML implements YAML 1.1, where unquoted scalars such as `yes`, `off`
+        or `1:30` resolve to booleans and sexagesimal numbers. The ruamel
+        loader used everywhere else in this package is pinned to YAML 1.2, so
+        the implicit resolvers and constructors below are replaced to mirror
+        its behaviour for the tags whose rules differ between the versions.
+        """
+
+    def _construct_yaml_int_1_2(loader: "_FastYamlLoader", node: Any) -> int:
+        value = loader.construct_scalar(node).replace("_", "")
+        sign = 1
+        if value[0] in "+-":
+            if value[0] == "-":
+                sign = -1
+            value = value[1:]
+        if value.startswith("0b"):
+            return sign * int(value[2:], 2)
+        if value.startswith("0x"):
+            return sign * int(value[2:], 16)
+        if value.startswith("0o"):
+            return sign * int(value[2:], 8)
+        # Unlike YAML 1.1, a leading zero does not make a number octal.
+        return sign * int(value)
+
+    def _construct_yaml_timestamp_1_2(
+        loader: "_FastYamlLoader", node: Any
+    ) -> datetime.datetime:
+        timestamp = _CSafeLoader.construct_yaml_timestamp(loader, node)
+        if (
+            isinstance(timestamp, datetime.datetime)
+            and timestamp.tzinfo is not None
+        ):
+            # The ruamel loader normalizes zoned timestamps to naive UTC.
+            timestamp = timestamp.astimezone(datetime.timezone.utc).replace(
+                tzinfo=None
+            )
+        return timestamp
+
+    _YAML_1_1_ONLY_TAGS = frozenset(
+        ("tag:yaml.org,2002:bool", "tag:yaml.org,2002:int", "tag:yaml.org,2002:float")
+    )
+    _FastYamlLoader.yaml_implicit_resolvers = {
+        first_char: [
+            (tag, regexp) for tag, regexp in resolvers if tag not in _YAML_1_1_ONLY_TAGS
+        ]
+        for first_char, resolvers in _CSafeLoader.yaml_implicit_resolvers.items()
+    }
+    # The replacement regexes are the YAML 1.2 rules the ruamel resolver uses.
+    _FastYamlLoader.add_implicit_resolver(
+        "tag:yaml.org,2002:bool",
+        re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$"),
+        list("tTfF"),
+    )
+    _FastYamlLoader.add_implicit_resolver(
+        "tag:yaml.org,2002:int",
+        re.compile(
+            r"^(?:[-+]?0b[0-1_]+"
+            r"|[-+]?0o?[0-7_]+"
+            r"|[-+]?[0-9_]+"
+            r"|[-+]?0x[0-9a-fA-F_]+)$"
+        ),
+        list("-+0123456789"),
+    )
+    _FastYamlLoader.add_implicit_resolver(
+        "tag:yaml.org,2002:float",
+        re.compile(
+            r"^(?:[-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+]?[0-9]+)?"
+            r"|[-+]?(?:[0-9][0-9_]*)(?:[eE][-+]?[0-9]+)"
+            r"|[-+]?\.[0-9_]+(?:[eE][-+][0-9]+)?"
+            r"|[-+]?\.(?:inf|Inf|INF)"
+            r"|\.(?:nan|NaN|NAN))$"
+        ),
+        list("-+0123456789."),
+    )
+    def _env_var_constructor(loader: "_FastYamlLoader", node: Any) -> Text:
+        """Process environment variables found in the YAML."""
+        value = loader.construct_scalar(node)
+        expanded_vars = os.path.expandvars(value)
+        not_expanded = [
+            w for w in expanded_vars.split() if w.startswith("$") and w in value
+        ]
+        if not_expanded:
+            raise RasaException(
+                f"Error when trying to expand the "
+                f"environment variables in '{value}'. "
+                f"Please make sure to also set these "
+                f"environment variables: '{not_expanded}'."
+            )
+        return expanded_vars
+
+    _FastYamlLoader.add_constructor(
+        "tag:yaml.org,2002:int", _construct_yaml_int_1_2
+    )
+    _FastYamlLoader.add_constructor(
+        "tag:yaml.org,2002:timestamp", _construct_yaml_timestamp_1_2
+    )
+    # The default loader expands `${ENV_VAR}` references via the resolver that
+    # `rasa.shared.utils.io.replace_environment_variables` installs; mirror it.
+    _FastYamlLoader.add_implicit_resolver(
+        "!env_var", re.compile(r"^(.*)\$\{(.*)\}(.*)$"), None
+    )
+    _FastYamlLoader.add_constructor("!env_var", _env_var_constructor)
+
 logger = logging.getLogger(__name__)
 
 KEY_NLU = "nlu"
@@ -42,10 +176,91 @@ KEY_METADATA = "metadata"
 
 MULTILINE_TRAINING_EXAMPLE_LEADING_SYMBOL = "-"
 
+# Matches lines starting (possibly indented) with one of the keys which mark a
+# YAML file as containing NLU training data.
+_NLU_KEYS_PATTERN = re.compile(
+    rf"^[ \t]*({KEY_NLU}|{KEY_RESPONSES}):", re.MULTILINE
+)
+
+# Static fragments of warning messages, rendered once at import time so the
+# warning paths only interpolate the values that actually vary per call.
+_UNEXPECTED_NLU_BLOCK_HINT = (
+    f"Items under the '{KEY_NLU}' key must be YAML dictionaries. "
+    f"This block will be skipped."
+)
+_SUPPORTED_NLU_KEYS = (
+    f"'{KEY_INTENT}', '{KEY_SYNONYM}', '{KEY_REGEX}', '{KEY_LOOKUP}'"
+)
+
 NLU_SCHEMA_FILE = "shared/nlu/training_data/schemas/nlu.yml"
 
 STRIP_SYMBOLS = "\n\r "
 
+# Digests of contents which have already passed schema validation. Validation
+# parses the full document with the round-trip loader, so skipping it for
+# already seen content (e.g. the same file being read repeatedly during tests
+# or project loading) saves a complete parsing pass.
+_VALIDATED_CONTENT_DIGESTS: Set[bytes] = set()
+_VALIDATION_CACHE_MAX_SIZE = 64
+
+
+def _iter_lines(text: Text) -> Iterator[Text]:
+    """Iterates over the lines of a multiline scalar block.
+
+    Scans for newline characters directly instead of using `str.splitlines`,
+    which avoids materializing a list of all lines and checking every
+    character for the unicode line separators that never occur in YAML
+    literal scalars.
+
+    Args:
+        text: a multiline text block
+
+    Returns:
+        The lines of the block, without their line endings.
+    """
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find("\n", start)
+        if end == -1:
+            yield text[start:]
+            return
+        if end > start and text[end - 1] == "\r":
+            # Strip Windows-style line endings like `splitlines` would.
+            yield text[start : end - 1]
+        else:
+            yield text[start:end]
+        start = end + 1
+
+
+def _fast_read_yaml(content: Text) -> Any:
+    """Parses YAML content into plain Python objects.
+
+    Uses the C-accelerated `libyaml` loader when available, which avoids the
+    pure-Python tokenizer/parser pass for large NLU files. Syntax validation
+    has already happened via the schema check at this point, and no round-trip
+    information (comments, quoting) is needed for reading training data.
+
+    Args:
+        content: A text containing yaml content.
+
+    Returns:
+        The parsed content.
+    """
+    if _FastYamlLoader is None:
+        return rasa.shared.utils.io.read_yaml(content)
+
+    if content.isascii():
+        # Required to make sure emojis are correctly parsed
+        content = (
+            content.encode("utf-8")
+            .decode("raw_unicode_escape")
+            .encode("utf-16", "surrogatepass")
+            .decode("utf-16")
+        )
+
+    return _fast_yaml_load(content, Loader=_FastYamlLoader) or {}
+
 
 class RasaYAMLReader(TrainingDataReader):
     """Reads YAML training data and creates a TrainingData object."""
@@ -62,12 +277,20 @@ class RasaYAMLReader(TrainingDataReader):
         """Check if the string adheres to the NLU yaml data schema.
 
         If the string is not in the right format, an exception will be raised."""
+        digest = hashlib.blake2b(string.encode("utf-8")).digest()
+        if digest in _VALIDATED_CONTENT_DIGESTS:
+            return
+
         try:
             validation.validate_yaml_schema(string, NLU_SCHEMA_FILE)
         except YamlException as e:
             e.filename = self.filename
             raise e
 
+        if len(_VALIDATED_CONTENT_DIGESTS) >= _VALIDATION_CACHE_MAX_SIZE:
+            _VALIDATED_CONTENT_DIGESTS.clear()
+        _VALIDATED_CONTENT_DIGESTS.add(digest)
+
     def reads(self, string: Text, **kwargs: Any) -> "TrainingData":
         """Reads TrainingData in YAML format from a string.
 
@@ -80,7 +303,7 @@ class RasaYAMLReader(TrainingDataReader):
         """
         self.validate(string)
 
-        yaml_content = rasa.shared.utils.io.read_yaml(string)
+        yaml_content = _fast_read_yaml(string)
 
         if not validation.validate_training_data_format_version(
             yaml_content, self.filename
@@ -106,40 +329,36 @@ class RasaYAMLReader(TrainingDataReader):
         if not nlu_data:
             return
 
-        for nlu_item in nlu_data:
+        for index, nlu_item in enumerate(nlu_data):
+            # Release each block once it has been converted so the parsed YAML
+            # tree and the created training examples do not need to coexist
+            # fully in memory for large files.
+            nlu_data[index] = None
+
             if not isinstance(nlu_item, dict):
                 rasa.shared.utils.io.raise_warning(
                     f"Unexpected block found in '{self.filename}':\n"
                     f"{nlu_item}\n"
-                    f"Items under the '{KEY_NLU}' key must be YAML dictionaries. "
-                    f"This block will be skipped.",
+                    f"{_UNEXPECTED_NLU_BLOCK_HINT}",
                     docs=DOCS_URL_TRAINING_DATA,
                 )
                 continue
 
-            if KEY_INTENT in nlu_item.keys():
-                self._parse_intent(nlu_item)
-            elif KEY_SYNONYM in nlu_item.keys():
-                self._parse_synonym(nlu_item)
-            elif KEY_REGEX in nlu_item.keys():
-                self._parse_regex(nlu_item)
-            elif KEY_LOOKUP in nlu_item.keys():
-                self._parse_lookup(nlu_item)
+            for item_key, parser in self._ITEM_PARSERS.items():
+                if item_key in nlu_item:
+                    parser(self, nlu_item)
+                    break
             else:
                 rasa.shared.utils.io.raise_warning(
                     f"Issue found while processing '{self.filename}': "
                     f"Could not find supported key in the section:\n"
                     f"{nlu_item}\n"
-                    f"Supported keys are: '{KEY_INTENT}', '{KEY_SYNONYM}', "
-                    f"'{KEY_REGEX}', '{KEY_LOOKUP}'. "
+                    f"Supported keys are: {_SUPPORTED_NLU_KEYS}. "
                     f"This section will be skipped.",
                     docs=DOCS_URL_TRAINING_DATA,
                 )
 
     def _parse_intent(self, intent_data: Dict[Text, Any]) -> None:
-        import rasa.shared.nlu.training_data.entities_parser as entities_parser
-        import rasa.shared.nlu.training_data.synonyms_parser as synonyms_parser
-
         intent = intent_data.get(KEY_INTENT, "")
         if not intent:
             rasa.shared.utils.io.raise_warning(
@@ -151,36 +370,50 @@ class RasaYAMLReader(TrainingDataReader):
             )
             return
 
+        # Every message of an intent block references the same intent name;
+        # interning makes the copies parsed out of YAML share one string
+        # object across files and speeds up later equality checks and hashing.
+        # Guarded so a non-string scalar keeps its usual handling downstream
+        # instead of raising from the intern call.
+        if isinstance(intent, str):
+            intent = sys.intern(intent)
+
         examples = intent_data.get(KEY_INTENT_EXAMPLES, "")
         intent_metadata = intent_data.get(KEY_METADATA)
-        for example, entities, metadata in self._parse_training_examples(
-            examples, intent
-        ):
 
-            plain_text = entities_parser.replace_entities(example)
+        example_tuples = self._parse_training_examples(examples, intent)
 
+        for plain_text, entities, _ in example_tuples:
             synonyms_parser.add_synonyms_from_entities(
                 plain_text, entities, self.entity_synonyms
             )
 
-            self.training_examples.append(
-                Message.build(plain_text, intent, entities, intent_metadata, metadata)
-            )
+        # One extend per intent block avoids repeated amortized list growth on
+        # the shared training example list.
+        self.training_examples.extend(
+            Message.build_batch(example_tuples, intent, intent_metadata)
+        )
 
     def _parse_training_examples(
         self, examples: Union[Text, List[Dict[Text, Any]]], intent: Text
     ) -> List[Tuple[Text, List[Dict[Text, Any]], Optional[Any]]]:
-        import rasa.shared.nlu.training_data.entities_parser as entities_parser
-
         if isinstance(examples, list):
-            example_tuples = [
-                (
-                    example.get(KEY_INTENT_TEXT, "").strip(STRIP_SYMBOLS),
-                    example.get(KEY_METADATA),
-                )
-                for example in examples
-                if example
-            ]
+            if examples and isinstance(examples[0], str):
+                # A list of plain scalars needs no per-element dict lookups.
+                example_tuples = [
+                    (example.strip(STRIP_SYMBOLS), None)
+                    for example in examples
+                    if example
+                ]
+            else:
+                example_tuples = [
+                    (
+                        example.get(KEY_INTENT_TEXT, "").strip(STRIP_SYMBOLS),
+                        example.get(KEY_METADATA),
+                    )
+                    for example in examples
+                    if example
+                ]
         elif isinstance(examples, str):
             example_tuples = [
                 (example, None)
@@ -203,16 +436,15 @@ class RasaYAMLReader(TrainingDataReader):
                 docs=DOCS_URL_TRAINING_DATA,
             )
 
-        results = []
-        for example, metadata in example_tuples:
-            entities = entities_parser.find_entities_in_training_example(example)
-            results.append((example, entities, metadata))
-
-        return results
+        # The comprehension allocates the result list at its final size instead
+        # of growing it example by example. Entity extraction and plain-text
+        # rendering happen in one pass over each example.
+        return [
+            (*entities_parser.extract_entities_and_text(example), metadata)
+            for example, metadata in example_tuples
+        ]
 
     def _parse_synonym(self, nlu_item: Dict[Text, Any]) -> None:
-        import rasa.shared.nlu.training_data.synonyms_parser as synonyms_parser
-
         synonym_name = nlu_item[KEY_SYNONYM]
         if not synonym_name:
             rasa.shared.utils.io.raise_warning(
@@ -282,8 +514,6 @@ class RasaYAMLReader(TrainingDataReader):
             self.regex_features.append({"name": regex_name, "pattern": example})
 
     def _parse_lookup(self, nlu_item: Dict[Text, Any]) -> None:
-        import rasa.shared.nlu.training_data.lookup_tables_parser as lookup_tables_parser  # noqa: E501
-
         lookup_item_name = nlu_item[KEY_LOOKUP]
         if not lookup_item_name:
             rasa.shared.utils.io.raise_warning(
@@ -319,9 +549,27 @@ class RasaYAMLReader(TrainingDataReader):
                 lookup_item_name, example, self.lookup_tables
             )
 
-    def _parse_multiline_example(self, item: Text, examples: Text) -> Iterator[Text]:
-        for example in examples.splitlines():
-            if not example.startswith(MULTILINE_TRAINING_EXAMPLE_LEADING_SYMBOL):
+    # Maps nlu item keys to their parser methods. Declared once so `_parse_nlu`
+    # can dispatch via a dict instead of a chain of key comparisons; the order
+    # mirrors the original dispatch order.
+    _ITEM_PARSERS = {
+        KEY_INTENT: _parse_intent,
+        KEY_SYNONYM: _parse_synonym,
+        KEY_REGEX: _parse_regex,
+        KEY_LOOKUP: _parse_lookup,
+    }
+
+    def _parse_multiline_example(self, item: Text, examples: Text) -> List[Text]:
+        # This is the innermost loop when reading large NLU files. Building a
+        # plain list via a bound `append` keeps the per-line work to a slice,
+        # a strip and an append, without suspending/resuming a generator frame
+        # for every example.
+        parsed = []
+        append = parsed.append
+        leading_symbol = MULTILINE_TRAINING_EXAMPLE_LEADING_SYMBOL
+        strip_symbols = STRIP_SYMBOLS
+        for example in _iter_lines(examples):
+            if not example.startswith(leading_symbol):
                 rasa.shared.utils.io.raise_warning(
                     f"Issue found while processing '{self.filename}': "
                     f"The item '{item}' contains an example that doesn't start with a "
@@ -331,7 +579,8 @@ class RasaYAMLReader(TrainingDataReader):
                     docs=DOCS_URL_TRAINING_DATA,
                 )
                 continue
-            yield example[1:].strip(STRIP_SYMBOLS)
+            append(example[1:].strip(strip_symbols))
+        return parsed
 
     @staticmethod
     def is_yaml_nlu_file(filename: Union[Text, Path]) -> bool:
@@ -351,7 +600,11 @@ class RasaYAMLReader(TrainingDataReader):
         if not rasa.shared.data.is_likely_yaml_file(filename):
             return False
 
-        return rasa.shared.utils.io.is_key_in_yaml(filename, KEY_NLU, KEY_RESPONSES)
+        # A single regex scan over the content is considerably faster than
+        # checking every line in a Python loop for directories with many
+        # non-NLU YAML files (domains, configs, stories).
+        content = rasa.shared.utils.io.read_file(filename)
+        return _NLU_KEYS_PATTERN.search(content) is not None
 
 
 class RasaYAMLWriter(TrainingDataWriter):
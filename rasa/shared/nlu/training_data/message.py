@@ -187,6 +187,50 @@ class Message:
 
         return cls(data, **kwargs)
 
+    @classmethod
+    def build_batch(
+        cls,
+        examples: List[Tuple[Text, List[Dict[Text, Any]], Optional[Any]]],
+        intent: Optional[Text] = None,
+        intent_metadata: Optional[Any] = None,
+    ) -> List["Message"]:
+        """Builds messages for multiple examples of the same intent.
+
+        The intent-dependent fields are computed once and shared by all
+        messages, which avoids re-splitting the intent label per example.
+
+        Args:
+            examples: tuples of text, entities and example metadata
+            intent: the common intent of all examples
+            intent_metadata: optional metadata for the intent
+
+        Returns:
+            Messages for all examples.
+        """
+        base: Dict[Text, Any] = {}
+        if intent:
+            split_intent, response_key = cls.separate_intent_response_key(intent)
+            if split_intent:
+                base[INTENT] = split_intent
+            if response_key:
+                # intent label can be of the form - {intent}/{response_key},
+                # so store the full intent label in intent_response_key
+                base[INTENT_RESPONSE_KEY] = intent
+
+        messages: List["Message"] = []
+        append = messages.append
+        for text, entities, example_metadata in examples:
+            data = {TEXT: text, **base}
+            if entities:
+                data[ENTITIES] = entities
+            if intent_metadata is not None:
+                data[METADATA] = {METADATA_INTENT: intent_metadata}
+            if example_metadata is not None:
+                data.setdefault(METADATA, {})[METADATA_EXAMPLE] = example_metadata
+            append(cls(data))
+
+        return messages
+
     def get_full_intent(self) -> Text:
         """Get intent as it appears in training data"""
 
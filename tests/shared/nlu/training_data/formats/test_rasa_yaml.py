@@ -4,7 +4,9 @@ from typing import Text
 import pytest
 import pathlib
 
-from rasa.shared.exceptions import YamlException, YamlSyntaxException
+from _pytest.monkeypatch import MonkeyPatch
+
+from rasa.shared.exceptions import RasaException, YamlException, YamlSyntaxException
 import rasa.shared.utils.io
 from rasa.shared.constants import LATEST_TRAINING_DATA_FORMAT_VERSION
 from rasa.shared.nlu.constants import (
@@ -16,6 +18,7 @@ from rasa.shared.nlu.constants import (
 from rasa.shared.nlu.training_data.formats.rasa_yaml import (
     RasaYAMLReader,
     RasaYAMLWriter,
+    _fast_read_yaml,
 )
 
 
@@ -364,6 +367,63 @@ def test_minimal_yaml_nlu_file(tmp_path: pathlib.Path):
     assert RasaYAMLReader.is_yaml_nlu_file(target_file)
 
 
+@pytest.mark.parametrize(
+    "content",
+    [
+        # scalars whose resolution differs between YAML 1.1 and YAML 1.2
+        "value: yes",
+        "value: no",
+        "value: on",
+        "value: Off",
+        "value: 010",
+        "value: 0o10",
+        "value: 0x1F",
+        "value: 1:30",
+        "value: 1_000",
+        "value: .inf",
+        "value: 1e3",
+        "value: 1.5e3",
+        "value: 2020-01-01",
+        "value: 2001-12-14t21:59:43.10-05:00",
+        "value: plain text",
+    ],
+)
+def test_fast_loader_matches_default_loader(content: Text):
+    assert _fast_read_yaml(content) == rasa.shared.utils.io.read_yaml(content)
+
+
+def test_fast_loader_expands_environment_variables(monkeypatch: MonkeyPatch):
+    monkeypatch.setenv("RASA_TEST_GREETING", "hello")
+
+    content = "value: ${RASA_TEST_GREETING}"
+    assert _fast_read_yaml(content) == {"value": "hello"}
+    assert _fast_read_yaml(content) == rasa.shared.utils.io.read_yaml(content)
+
+
+def test_fast_loader_raises_on_unset_environment_variable(monkeypatch: MonkeyPatch):
+    monkeypatch.delenv("RASA_TEST_GREETING", raising=False)
+
+    with pytest.raises(RasaException):
+        _fast_read_yaml("value: ${RASA_TEST_GREETING}")
+
+
+def test_boolean_like_intent_name_is_read_as_string():
+    parser = RasaYAMLReader()
+
+    training_data = parser.reads(
+        textwrap.dedent(
+            """
+            nlu:
+            - intent: yes
+              examples: |
+                - yes please
+            """
+        )
+    )
+
+    assert training_data.intents == {"yes"}
+
+
 def test_nlg_reads_text():
     responses_yml = textwrap.dedent(
         """
@@ -117,6 +117,31 @@ def test_markdown_entity_regex(
     assert replaced_text == expected_text
 
 
+@pytest.mark.parametrize(
+    "example",
+    [
+        # no entities
+        "i'm looking for a place to eat",
+        # markup at string start and end
+        "[economy class](travel_flight_class:economy)",
+        "[boston](city) to [new york](city)",
+        # adjacent entities
+        "[first](one)[second](two)",
+        # dict syntax entities
+        'I want to fly from [Berlin]{"entity": "city", "role": "to"} to [LA]{'
+        '"entity": "city", "role": "from", "value": "Los Angeles"}',
+        # mixed syntax with surrounding text
+        "show me [chines](cuisine:chinese) restaurants in the "
+        "[north](loc-direction) of town",
+    ],
+)
+def test_extract_entities_and_text_matches_two_pass_extraction(example: Text):
+    plain_text, entities = entities_parser.extract_entities_and_text(example)
+
+    assert plain_text == entities_parser.replace_entities(example)
+    assert entities == entities_parser.find_entities_in_training_example(example)
+
+
 def test_parse_training_example():
     message = entities_parser.parse_training_example("Hello!", intent="greet")
     assert message.get("intent") == "greet"
@@ -377,6 +377,39 @@ def test_is_core_or_domain_message(
     assert result == message.is_core_or_domain_message()
 
 
+@pytest.mark.parametrize(
+    "intent, intent_metadata",
+    [
+        (None, None),
+        ("greet", None),
+        ("greet", "initiate-conversation"),
+        # retrieval intent of the form {intent}/{response_key}
+        ("chitchat/ask_weather", None),
+        ("chitchat/ask_weather", {"topic": "weather"}),
+    ],
+)
+def test_build_batch_matches_per_example_build(
+    intent: Optional[Text], intent_metadata: Optional[Text]
+):
+    examples = [
+        ("hello there", [], None),
+        (
+            "flight from boston",
+            [{"start": 12, "end": 18, "value": "boston", "entity": "city"}],
+            None,
+        ),
+        ("good morning", [], "positive-sentiment"),
+    ]
+
+    batch = Message.build_batch(examples, intent, intent_metadata)
+
+    expected = [
+        Message.build(text, intent, entities, intent_metadata, example_metadata)
+        for text, entities, example_metadata in examples
+    ]
+    assert batch == expected
+
+
 def test_add_diagnostic_data_with_repeated_component_raises_warning():
     message = Message()
     message.add_diagnostic_data("a", {})